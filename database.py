@@ -6,6 +6,7 @@ Import and use these functions in your API endpoints for database operations.
 """
 
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
@@ -16,7 +17,9 @@ from pydantic import BaseModel
 load_dotenv()
 
 _client = None
+_async_client = None
 db = None
+db_async = None
 
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
@@ -24,11 +27,15 @@ database_name = os.getenv("DATABASE_NAME")
 if database_url and database_name:
     _client = MongoClient(database_url)
     db = _client[database_name]
+    # Async handle for request handlers; the sync client stays around for
+    # startup tasks (index creation) and diagnostics.
+    _async_client = AsyncIOMotorClient(database_url)
+    db_async = _async_client[database_name]
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
-    if db is None:
+    if db_async is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
     # Convert Pydantic model to dict if needed
@@ -40,16 +47,25 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db_async[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, sort: list = None, hint: str = None, projection: dict = None, collation: dict = None):
     """Get documents from collection"""
-    if db is None:
+    if db_async is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-    
-    cursor = db[collection_name].find(filter_dict or {})
+
+    cursor = db_async[collection_name].find(filter_dict or {}, projection)
+    if collation:
+        cursor = cursor.collation(collation)
+    if hint:
+        cursor = cursor.hint(hint)
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
-    
-    return list(cursor)
+
+    # to_list drains the cursor in driver-level batches into one preallocated
+    # list, instead of resuming the coroutine once per document. to_list
+    # rejects negative lengths, so only positive limits are passed through.
+    return await cursor.to_list(length=limit if limit and limit > 0 else None)
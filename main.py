@@ -1,25 +1,63 @@
-import os
+import asyncio
 import hashlib
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException
+import os
+import re
+import time
+from typing import Any, Optional, List
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, field_validator
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
-from database import db, create_document, get_documents
+from database import db, db_async, create_document, get_documents
 from schemas import Artifact, UserAccount
 
 
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson, skipping FastAPI's jsonable_encoder.
+
+    ``default=str`` takes care of non-native types such as ObjectId.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str)
+
+
+# Cheap RFC-5321-shaped gate for auth payloads; the full email-validator
+# machinery behind EmailStr is overkill (and slow) on this hot path.
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
 class SignupRequest(BaseModel):
     name: str
-    email: EmailStr
+    email: str
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def _email_shape(cls, v: str) -> str:
+        if not _EMAIL_RE.fullmatch(v):
+            raise ValueError("invalid email address")
+        return v
+
 
 class SigninRequest(BaseModel):
-    email: EmailStr
+    email: str
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def _email_shape(cls, v: str) -> str:
+        if not _EMAIL_RE.fullmatch(v):
+            raise ValueError("invalid email address")
+        return v
+
 
 class PublicArtifact(BaseModel):
     id: str
@@ -33,23 +71,54 @@ class PublicArtifact(BaseModel):
 
 app = FastAPI(title="NEUST Museum API")
 
+# With credentials off, Starlette can reuse a static preflight response, and
+# max_age lets browsers cache it so repeat OPTIONS round-trips disappear.
+# Auth uses bearer tokens in the Authorization header, so cookies/credentials
+# are not needed. Set CORS_ALLOW_ORIGINS to a comma-separated list in prod.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=os.getenv("CORS_ALLOW_ORIGINS", "*").split(","),
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+# Case-insensitive collation shared by the title index and the prefix-search
+# queries that want to use it.
+_SEARCH_COLLATION = {"locale": "en", "strength": 2}
+
+# A valid ObjectId is exactly 24 hex chars; checking the shape up front keeps
+# malformed IDs off the exception path.
+_OID_RE = re.compile(r"^[0-9a-fA-F]{24}$")
+
+
+@app.on_event("startup")
+def create_indexes():
+    if db is None:
+        return
+    db["artifact"].create_index(
+        [("title", "text"), ("description", "text"), ("tags", "text")],
+        name="artifact_text",
+    )
+    db["artifact"].create_index([("featured", 1), ("_id", -1)], name="featured_id")
+    db["useraccount"].create_index("email", unique=True, name="email_unique")
+    db["artifact"].create_index([("title", 1)], name="title_ci", collation=_SEARCH_COLLATION)
+
+
+_ROOT_BYTES = orjson.dumps({"message": "NEUST Museum API Running"})
+_ROOT_ETAG = hashlib.md5(_ROOT_BYTES).hexdigest()
+
 
 @app.get("/")
-def read_root():
-    return {"message": "NEUST Museum API Running"}
+def read_root(request: Request):
+    return _static_json(request, _ROOT_BYTES, _ROOT_ETAG)
 
 
-@app.get("/api/about")
-def get_about():
-    return {
+# The about/visit payloads only change at deploy time, so serialize them once
+# at import and serve the cached bytes (with a 304 when the ETag matches).
+_ABOUT_BYTES = orjson.dumps(
+    {
         "name": "NEUST Museum",
         "tagline": "Preserving history, inspiring discovery.",
         "history": "The NEUST Museum curates a diverse collection of artifacts spanning culture, technology, and the environment. Our mission is to educate and inspire through immersive exhibits and community programs.",
@@ -61,11 +130,11 @@ def get_about():
             "address": "123 University Ave, Science City",
         },
     }
+)
+_ABOUT_ETAG = hashlib.md5(_ABOUT_BYTES).hexdigest()
 
-
-@app.get("/api/visit")
-def get_visit():
-    return {
+_VISIT_BYTES = orjson.dumps(
+    {
         "hours": [
             {"days": "Mon-Fri", "time": "9:00 AM - 6:00 PM"},
             {"days": "Sat", "time": "10:00 AM - 5:00 PM"},
@@ -85,90 +154,168 @@ def get_visit():
             "children": 0,
         },
     }
+)
+_VISIT_ETAG = hashlib.md5(_VISIT_BYTES).hexdigest()
+
+
+# Static payloads only change at deploy time; let browsers and CDNs reuse
+# them for an hour and serve stale copies while revalidating.
+_STATIC_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
 
 
-@app.get("/api/artifacts", response_model=List[PublicArtifact])
-def list_artifacts(q: Optional[str] = None, featured: Optional[bool] = None, limit: int = 50):
+def _static_json(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": _STATIC_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/about")
+def get_about(request: Request):
+    return _static_json(request, _ABOUT_BYTES, _ABOUT_ETAG)
+
+
+@app.get("/api/visit")
+def get_visit(request: Request):
+    return _static_json(request, _VISIT_BYTES, _VISIT_ETAG)
+
+
+# Only the fields the public payload renders; skipping the rest cuts BSON
+# decode time and bytes on the wire.
+_ARTIFACT_PROJECTION = {
+    "title": 1,
+    "description": 1,
+    "image_url": 1,
+    "period": 1,
+    "collection": 1,
+    "tags": 1,
+}
+
+
+def _public_artifact_dict(doc: dict) -> dict:
+    """Shape a raw Mongo document like PublicArtifact without model overhead."""
+    return {
+        "id": str(doc.get("_id")),
+        "title": doc.get("title"),
+        "description": doc.get("description"),
+        "image_url": doc.get("image_url"),
+        "period": doc.get("period"),
+        "collection": doc.get("collection"),
+        "tags": doc.get("tags"),
+    }
+
+
+@app.get("/api/artifacts")
+async def list_artifacts(q: Optional[str] = None, featured: Optional[bool] = None, limit: int = 50):
     if db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
     filter_query = {}
+    sort = None
+    collation = None
     if q:
-        filter_query["$or"] = [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"description": {"$regex": q, "$options": "i"}},
-            {"tags": {"$regex": q, "$options": "i"}},
-        ]
+        if len(q) <= 32 and not any(ch.isspace() for ch in q):
+            # Short single-token queries: a range predicate over [q, q + U+FFFF)
+            # matches titles starting with q and, unlike $regex (which is not
+            # collation-aware), range-scans the strength-2 title_ci index so the
+            # prefix match stays case-insensitive.
+            filter_query["title"] = {"$gte": q, "$lt": q + "\uffff"}
+            collation = _SEARCH_COLLATION
+        else:
+            filter_query["$text"] = {"$search": q}
+            sort = [("score", {"$meta": "textScore"})]
     if featured is not None:
         filter_query["featured"] = bool(featured)
-    docs = get_documents("artifact", filter_query, limit)
-    results: List[PublicArtifact] = []
-    for d in docs:
-        results.append(
-            PublicArtifact(
-                id=str(d.get("_id")),
-                title=d.get("title"),
-                description=d.get("description"),
-                image_url=d.get("image_url"),
-                period=d.get("period"),
-                collection=d.get("collection"),
-                tags=d.get("tags"),
-            )
-        )
-    return results
-
-
-@app.get("/api/artifacts/{artifact_id}", response_model=PublicArtifact)
-def get_artifact(artifact_id: str):
+    # A featured-only filter can walk the (featured, _id) index and stop
+    # after `limit` entries instead of scanning the collection.
+    hint = "featured_id" if not q and featured is not None else None
+    docs = await get_documents("artifact", filter_query, limit, sort=sort, hint=hint, projection=_ARTIFACT_PROJECTION, collation=collation)
+    return ORJSONResponse([_public_artifact_dict(d) for d in docs])
+
+
+@app.get("/api/artifacts/{artifact_id}")
+async def get_artifact(artifact_id: str):
     if db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
-    try:
-        oid = ObjectId(artifact_id)
-    except Exception:
+    if not _OID_RE.match(artifact_id):
         raise HTTPException(status_code=400, detail="Invalid artifact id")
-    doc = db["artifact"].find_one({"_id": oid})
+    oid = ObjectId(artifact_id)
+    doc = await db_async["artifact"].find_one({"_id": oid}, _ARTIFACT_PROJECTION)
     if not doc:
         raise HTTPException(status_code=404, detail="Artifact not found")
-    return PublicArtifact(
-        id=str(doc["_id"]),
-        title=doc.get("title"),
-        description=doc.get("description"),
-        image_url=doc.get("image_url"),
-        period=doc.get("period"),
-        collection=doc.get("collection"),
-        tags=doc.get("tags"),
-    )
+    return ORJSONResponse(_public_artifact_dict(doc))
+
+
+# Argon2id, tuned so a hash takes on the order of 100-200 ms: slow enough to
+# throttle brute force, fast enough that logins stay responsive.
+_PH = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=1)
 
 
 def hash_password(raw: str) -> str:
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return _PH.hash(raw)
 
 
 @app.post("/api/auth/signup")
-def signup(payload: SignupRequest):
+async def signup(payload: SignupRequest):
     if db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
-    existing = db["useraccount"].find_one({"email": payload.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    ua = UserAccount(
+    hashed = await asyncio.to_thread(hash_password, payload.password)
+    # Values are already validated on SignupRequest, so skip a second
+    # validation pass when building the storage model.
+    ua = UserAccount.model_construct(
         name=payload.name,
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=hashed,
+        role="user",
+        is_active=True,
     )
-    new_id = create_document("useraccount", ua)
+    # The unique email index rejects duplicates atomically, so no pre-check
+    # find_one is needed (and there is no race window between check and insert).
+    try:
+        new_id = await create_document("useraccount", ua)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     return {"id": new_id, "name": ua.name, "email": ua.email}
 
 
 @app.post("/api/auth/signin")
-def signin(payload: SigninRequest):
+async def signin(payload: SigninRequest):
     if db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
-    user = db["useraccount"].find_one({"email": payload.email})
-    if not user or user.get("password_hash") != hash_password(payload.password):
+    # Fetch only what signin needs; combined with the unique email index this
+    # is a single IXSCAN plus one small document decode.
+    user = await db_async["useraccount"].find_one(
+        {"email": payload.email}, {"password_hash": 1, "name": 1, "email": 1}
+    )
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    # InvalidHashError covers accounts whose stored hash predates Argon2
+    # (legacy SHA-256 digests or a missing field); treat them like a mismatch
+    # rather than surfacing a 500.
+    try:
+        await asyncio.to_thread(_PH.verify, user.get("password_hash", ""), payload.password)
+    except (VerifyMismatchError, InvalidHashError):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     return {"id": str(user.get("_id")), "name": user.get("name"), "email": user.get("email")}
 
 
+# /test gets hammered by liveness probes: the env vars cannot change after
+# startup, and collection names are cached for a short TTL so probes do not
+# thrash Mongo's metadata commands.
+_HAS_DB_URL = bool(os.getenv("DATABASE_URL"))
+_HAS_DB_NAME = bool(os.getenv("DATABASE_NAME"))
+
+_COLLECTIONS_TTL_SECONDS = 30.0
+_collections_cache = {"at": 0.0, "names": []}
+
+
+def _cached_collection_names():
+    now = time.monotonic()
+    if not _collections_cache["names"] or now - _collections_cache["at"] > _COLLECTIONS_TTL_SECONDS:
+        _collections_cache["names"] = db.list_collection_names()
+        _collections_cache["at"] = now
+    return _collections_cache["names"]
+
+
 @app.get("/test")
 def test_database():
     response = {
@@ -186,7 +333,7 @@ def test_database():
             response["database_name"] = db.name if hasattr(db, "name") else "✅ Connected"
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = _cached_collection_names()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -196,8 +343,8 @@ def test_database():
     except Exception as e:
         response["database"] = f"❌ Error: {str(e)[:50]}"
 
-    response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
+    response["database_url"] = "✅ Set" if _HAS_DB_URL else "❌ Not Set"
+    response["database_name"] = "✅ Set" if _HAS_DB_NAME else "❌ Not Set"
 
     return response
 
@@ -205,4 +352,11 @@ def test_database():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "2")),
+    )
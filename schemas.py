@@ -30,6 +30,6 @@ class UserAccount(BaseModel):
     """
     name: str = Field(..., description="Full name")
     email: EmailStr = Field(..., description="Unique email address")
-    password_hash: str = Field(..., description="Password hash (SHA256 for demo)")
+    password_hash: str = Field(..., description="Password hash (Argon2id encoded string)")
     role: str = Field(default="user", description="Role: user/admin")
     is_active: bool = Field(default=True)